@@ -0,0 +1,229 @@
+"""Numerical kernels shared by the parser and :class:`LabChartFile`.
+
+Kernels are compiled with Numba when it is installed. Otherwise an
+equivalent NumPy implementation is used, so Numba remains optional.
+Explicit signatures make Numba compile them once at import, and
+``cache=True`` keeps the machine code on disk for later processes.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+# Stitching state carried between chunks: (current block, time offset,
+# first relative time of the block, last relative time seen)
+StitchState = Tuple[int, float, float, float]
+STITCH_START: StitchState = (0, 0.0, 0.0, 0.0)
+
+try:
+    from numba import njit, types
+except ImportError:  # pragma: no cover - depends on the environment
+    njit = None
+else:
+    # Inputs are contiguous float64 arrays, read-only when they come from
+    # copy-on-write pandas columns (writable arrays are accepted as well)
+    _IN = types.Array(types.float64, 1, "C", readonly=True)
+    _OUT_F = types.Array(types.float64, 1, "A")
+    _OUT_I = types.Array(types.int64, 1, "A")
+    _STITCH_SIG = types.Tuple(
+        (_OUT_I, _OUT_F, types.int64, types.float64, types.float64, types.float64)
+    )(_IN, types.int64, types.float64, types.float64, types.float64)
+    _NEAREST_SIG = types.int64(_IN, types.float64)
+    _PAIR_CYCLES_SIG = types.UniTuple(_OUT_F, 5)(_IN, _IN, _IN, _IN)
+
+
+def block_bounds(edges: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(starts, ends)`` of the row ranges split at ``edges``.
+
+    ``edges`` are the row indices where a new range begins (excluding 0) and
+    ``n`` is the total number of rows.
+    """
+    starts = np.empty(edges.size + 1, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = edges
+    ends = np.empty(edges.size + 1, dtype=np.int64)
+    ends[:-1] = edges
+    ends[-1] = n
+    return starts, ends
+
+
+def _stitch_numpy(t, b, offset, t0, t_prev):
+    block_ids = np.empty(len(t), dtype=np.int64)
+    time_abs = np.empty(len(t), dtype=np.float64)
+    if len(t) == 0:
+        return block_ids, time_abs, b, offset, t0, t_prev
+    jumps = np.where(np.diff(t) < 0)[0] + 1
+    starts, ends = block_bounds(jumps, len(t))
+    for s, e in zip(starts, ends):
+        # Only the first segment can continue the block of the previous chunk
+        if s > 0 or b == 0 or t[0] < t_prev:
+            if b > 0:
+                offset = t_prev - t0 + offset
+            t0 = t[s]
+            b += 1
+        block_ids[s:e] = b
+        time_abs[s:e] = t[s:e] - t0 + offset
+        t_prev = t[e - 1]
+    return block_ids, time_abs, b, offset, t0, t_prev
+
+
+def _stitch_loop(t, b, offset, t0, t_prev):
+    n = t.shape[0]
+    block_ids = np.empty(n, np.int64)
+    time_abs = np.empty(n, np.float64)
+    for i in range(n):
+        # A backwards step in relative time starts a new block
+        if b == 0 or t[i] < t_prev:
+            if b > 0:
+                offset = t_prev - t0 + offset
+            t0 = t[i]
+            b += 1
+        block_ids[i] = b
+        time_abs[i] = t[i] - t0 + offset
+        t_prev = t[i]
+    return block_ids, time_abs, b, offset, t0, t_prev
+
+
+if njit is not None:
+    _stitch_impl = njit(_STITCH_SIG, cache=True)(_stitch_loop)
+else:
+    _stitch_impl = _stitch_numpy
+
+
+def _nearest_numpy(t: np.ndarray, x: np.ndarray) -> np.ndarray:
+    idx = np.searchsorted(t, x)
+    left = np.maximum(idx - 1, 0)
+    right = np.minimum(idx, len(t) - 1)
+    # Take the previous sample when it is at least as close
+    return np.where(x - t[left] <= t[right] - x, left, right)
+
+
+def _pair_cycles_numpy(t, p, ti, te):
+    pair_idx = np.searchsorted(te, ti, side="right")
+    has_end = pair_idx < len(te)
+    ti = ti[has_end]
+    te = te[pair_idx[has_end]]
+    ai = _nearest_numpy(t, ti)
+    ae = _nearest_numpy(t, te)
+    max_between = np.array(
+        [np.fmax.reduce(p[a:e + 1]) for a, e in zip(ai, ae)], dtype=np.float64
+    )
+    return ti, te, p[ai], p[ae], np.abs(p[ai] - max_between)
+
+
+def _nearest_loop(t, x):
+    n = t.shape[0]
+    i = np.searchsorted(t, x)
+    if i <= 0:
+        return 0
+    if i >= n:
+        return n - 1
+    if x - t[i - 1] <= t[i] - x:
+        return i - 1
+    return i
+
+
+def _pair_cycles_loop(t, p, ti, te):
+    n = ti.shape[0]
+    out_ti = np.empty(n, np.float64)
+    out_te = np.empty(n, np.float64)
+    out_pi = np.empty(n, np.float64)
+    out_pe = np.empty(n, np.float64)
+    out_diff = np.empty(n, np.float64)
+    m = 0
+    j = 0
+    for k in range(n):
+        # First end event strictly after this start event
+        while j < te.shape[0] and te[j] <= ti[k]:
+            j += 1
+        if j == te.shape[0]:
+            break
+        ai = _nearest_loop(t, ti[k])
+        ae = _nearest_loop(t, te[j])
+        mx = np.nan
+        for q in range(ai, ae + 1):
+            v = p[q]
+            if v == v and (mx != mx or v > mx):
+                mx = v
+        out_ti[m] = ti[k]
+        out_te[m] = te[j]
+        out_pi[m] = p[ai]
+        out_pe[m] = p[ae]
+        out_diff[m] = abs(p[ai] - mx)
+        m += 1
+    return out_ti[:m], out_te[:m], out_pi[:m], out_pe[:m], out_diff[:m]
+
+
+if njit is not None:
+    _nearest_loop = njit(_NEAREST_SIG, cache=True)(_nearest_loop)
+    _pair_cycles_impl = njit(_PAIR_CYCLES_SIG, cache=True)(_pair_cycles_loop)
+else:
+    _pair_cycles_impl = _pair_cycles_numpy
+
+
+def stitch_blocks(
+    t: np.ndarray, state: StitchState = STITCH_START
+) -> Tuple[np.ndarray, np.ndarray, StitchState]:
+    """Compute block indices and continuous time from relative times.
+
+    A new block starts wherever ``t`` decreases. Within each block, time is
+    shifted so that it continues from the last value of the previous block.
+
+    Parameters
+    ----------
+    t : numpy.ndarray
+        Relative time of each sample.
+    state : tuple, optional
+        State returned by the previous call when ``t`` continues an earlier
+        chunk of samples; :data:`STITCH_START` for the first chunk.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray, tuple]
+        ``(block_ids, time_abs, state)`` with 1-based block indices, the
+        continuous time across blocks and the state to pass along with the
+        next chunk.
+    """
+    *arrays, b, offset, t0, t_prev = _stitch_impl(
+        np.ascontiguousarray(t, dtype=np.float64), *state
+    )
+    return arrays[0], arrays[1], (b, offset, t0, t_prev)
+
+
+def pair_cycles(
+    t: np.ndarray, p: np.ndarray, t_start: np.ndarray, t_end: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pair start/end events and measure the signal over each cycle.
+
+    Each start time is paired with the first end time strictly after it;
+    start times without a later end are dropped. Event times are mapped to
+    the closest sample of ``t`` (the earlier one on ties).
+
+    Parameters
+    ----------
+    t : numpy.ndarray
+        Sorted sample times.
+    p : numpy.ndarray
+        Signal values, aligned with ``t``.
+    t_start, t_end : numpy.ndarray
+        Sorted times of the start and end events.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, ...]
+        ``(start_time, end_time, start_value, end_value, value_diff)`` where
+        ``value_diff`` is the absolute difference between the value at the
+        start and the maximum value (NaN ignored) from start to end.
+    """
+    t = np.ascontiguousarray(t, dtype=np.float64)
+    if len(t) == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty, empty, empty
+    return _pair_cycles_impl(
+        t,
+        np.ascontiguousarray(p, dtype=np.float64),
+        np.ascontiguousarray(t_start, dtype=np.float64),
+        np.ascontiguousarray(t_end, dtype=np.float64),
+    )
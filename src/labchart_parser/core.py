@@ -1,43 +1,131 @@
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ._kernels import block_bounds, pair_cycles
 from .parser import parse_labchart_txt
 from .exceptions import FileParsingError, InvalidChannelError
 
+# Columns added by the parser that are not recording channels
+_RESERVED = frozenset(("Time", "time_abs", "block", "Comment"))
+
+# Copy-on-write is always on from pandas 3, and opt-in before
+_PANDAS_3 = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _copy_on_write() -> bool:
+    return _PANDAS_3 or pd.options.mode.copy_on_write is True
+
+
 class LabChartFile:
+    # "__dict__" is kept for the cached_property value below
+    __slots__ = (
+        "_metadata",
+        "_channels",
+        "_channels_set",
+        "_columns",
+        "_block_slices",
+        "_blocks",
+        "__dict__",
+    )
+
     def __init__(self, df, meta):
-        self._data = df
         self._metadata = meta
+        self._channels = tuple(c for c in df.columns if c not in _RESERVED)
+        self._channels_set = frozenset(self._channels)
+        # One contiguous array per column rather than a single wide frame;
+        # each is wrapped in a Series so returned frames can share it
+        self._columns = {c: self._to_column(df[c]) for c in (*_RESERVED, *self._channels)}
+        self._block_slices = self._index_blocks(self._columns["block"].to_numpy())
+        self._blocks = tuple(sorted(self._block_slices))
 
     @classmethod
-    def from_file(cls, path: str) -> "LabChartFile":
-        df, meta = parse_labchart_txt(path)
+    def from_file(cls, path: str, engine: str = "pandas", dtype: str = "float64") -> "LabChartFile":
+        df, meta = parse_labchart_txt(path, engine=engine, dtype=dtype)
         return cls(df, meta)
 
+    @staticmethod
+    def _to_column(s):
+        if isinstance(s.dtype, np.dtype):
+            return pd.Series(np.ascontiguousarray(s.to_numpy()), copy=False)
+        return pd.Series(s.array, copy=False)
+
+    @staticmethod
+    def _index_blocks(blocks_arr):
+        # Blocks are contiguous and non-decreasing, so each one is a row range
+        if len(blocks_arr) == 0:
+            return {}
+        edges = np.flatnonzero(np.diff(blocks_arr)) + 1
+        starts, ends = block_bounds(edges, len(blocks_arr))
+        return {int(blocks_arr[s]): slice(int(s), int(e)) for s, e in zip(starts, ends)}
+
+    def _block_rows(self, b: int):
+        return self._block_slices.get(b, slice(0, 0))
+
+    def _frame(self, rows, names, copy: Optional[bool] = None):
+        if copy is None:
+            copy = not _copy_on_write()
+        d = pd.DataFrame({n: self._columns[c].iloc[rows] for n, c in names.items()}, copy=False)
+        return d.copy() if copy else d
+
     @property
     def metadata(self):
         return self._metadata
 
+    # Derived views are computed once and kept private; callers get their own
+    # copy so that editing it cannot change later results
     @property
     def channels(self):
-        return [c for c in self._data.columns
-                if c not in ("Time", "time_abs", "block", "Comment")]
+        return list(self._channels)
 
     @property
     def blocks(self):
-        return list(self._data["block"].unique())
+        return list(self._blocks)
+
+    @cached_property
+    def _comments(self):
+        m = self._columns["Comment"].notna().to_numpy()
+        return self._frame(m, {c: c for c in ("time_abs", "block", "Comment")}, copy=True)
 
     @property
     def comments(self):
-        return self._data[self._data["Comment"].notna()][["time_abs", "block", "Comment"]]
+        return self._comments.copy()
 
-    def get_block_df(self, b: int):
-        return self._data.loc[self._data["block"] == b, ["Time", "time_abs", "Comment", *self.channels]]
+    # With copy=False the returned frames share memory with the parsed data.
+    # By default this is done only under pandas copy-on-write, which copies
+    # them if they are modified; otherwise an edit would reach the parsed data.
+    def get_block_df(self, b: int, copy: Optional[bool] = None):
+        names = {c: c for c in ("Time", "time_abs", "Comment", *self._channels)}
+        return self._frame(self._block_rows(b), names, copy)
 
-    def get_channel(self, b: int, channel: str):
-        if channel not in self.channels:
+    def get_channel(self, b: int, channel: str, copy: Optional[bool] = None):
+        if channel not in self._channels_set:
             raise InvalidChannelError(f"Canal inconnu: {channel}")
-        d = self._data.loc[self._data["block"] == b, ["Time", "time_abs", "Comment", channel]].copy()
-        d.rename(columns={channel: "value"}, inplace=True)
-        return d
+        names = {"Time": "Time", "time_abs": "time_abs", "Comment": "Comment", "value": channel}
+        return self._frame(self._block_rows(b), names, copy)
 
     def slice_time_abs(self, tmin: float, tmax: float):
-        m = (self._data["time_abs"] >= tmin) & (self._data["time_abs"] <= tmax)
-        return self._data.loc[m, ["Time", "time_abs", "block", "Comment", *self.channels]]
\ No newline at end of file
+        t = self._columns["time_abs"].to_numpy()
+        m = (t >= tmin) & (t <= tmax)
+        names = {c: c for c in ("Time", "time_abs", "block", "Comment", *self._channels)}
+        return self._frame(m, names, copy=True)
+
+    def paired_cycles(self, b: int, channel: str, start: str = "INSPI", end: str = "EXPI"):
+        # Pair each `start` comment of block b with the first `end` comment
+        # after it; comments are matched ignoring case and surrounding spaces.
+        if channel not in self._channels_set:
+            raise InvalidChannelError(f"Canal inconnu: {channel}")
+        rows = self._block_rows(b)
+        comments = self._comments
+        labels = comments.loc[comments["block"] == b, "Comment"].str.strip().str.upper()
+        times = comments.loc[labels.index, "time_abs"].to_numpy(float)
+        cols = pair_cycles(
+            self._columns["time_abs"].to_numpy()[rows],
+            self._columns[channel].to_numpy()[rows],
+            times[(labels == start.upper()).to_numpy(bool)],
+            times[(labels == end.upper()).to_numpy(bool)],
+        )
+        names = ["start_time", "end_time", "start_value", "end_value", "value_diff"]
+        return pd.DataFrame(dict(zip(names, cols)))
@@ -4,8 +4,9 @@ This module defines a single function, :func:`parse_labchart_txt`, which
 reads a tab-delimited text file exported from ADInstruments LabChart and
 returns a pandas DataFrame and a dictionary of metadata.  The DataFrame
 contains one row per sample and includes a ``Comment`` column that
-captures annotation text for lines containing comments. Numeric sample
-lines have ``Comment`` set to ``None``.
+captures annotation text for lines containing comments, stored with the
+pandas ``string`` dtype (Arrow-backed when pyarrow is installed). Numeric
+sample lines have a missing ``Comment``.
 
 Additionally, ``block`` and ``time_abs`` columns are computed:
 
@@ -16,19 +17,35 @@ Additionally, ``block`` and ``time_abs`` columns are computed:
 
 from __future__ import annotations
 
-import re
-import math
+import csv
+import importlib.util
+import io
+import mmap
+import os
 from pathlib import Path
-from typing import Tuple, Dict, List, Optional
+from typing import Callable, Iterator, Tuple, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
-# Regular expression to detect a numeric field (float) in the first column
-FLOAT_START = re.compile(r"^\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*$")
+from ._kernels import STITCH_START, stitch_blocks
 
+# Approximate size of the pieces the data section is parsed in
+_CHUNK_BYTES = 1 << 25
 
-def parse_labchart_txt(path: str) -> Tuple[pd.DataFrame, Dict[str, object]]:
+# Cell values read as missing samples
+_NA_SET = frozenset(("*", ""))
+_NAN = float("nan")
+
+# Comments are sparse text: Arrow-backed strings avoid one object per row
+_COMMENT_DTYPE = (
+    "string[pyarrow]" if importlib.util.find_spec("pyarrow") is not None else "string"
+)
+
+
+def parse_labchart_txt(
+    path: str, engine: str = "pandas", dtype: str = "float64"
+) -> Tuple[pd.DataFrame, Dict[str, object]]:
     """Parse an exported LabChart text file.
 
     The export must be tab-delimited and include a ``Time`` column. If
@@ -39,6 +56,13 @@ def parse_labchart_txt(path: str) -> Tuple[pd.DataFrame, Dict[str, object]]:
     ----------
     path : str
         Path to the LabChart text file to parse.
+    engine : {"pandas", "polars"}, default "pandas"
+        Reader used for the data section. ``"polars"`` parses the samples
+        with multiple threads and requires the optional ``polars`` package.
+    dtype : {"float64", "float32"}, default "float64"
+        Floating-point type of ``Time``, the channels and ``time_abs``.
+        ``"float32"`` halves memory use for long recordings at the cost of
+        precision (about 7 significant digits).
 
     Returns
     -------
@@ -48,25 +72,45 @@ def parse_labchart_txt(path: str) -> Tuple[pd.DataFrame, Dict[str, object]]:
 
         * ``Time`` – relative time within each block.
         * one column per channel detected in the header.
-        * ``Comment`` – annotation text (``None`` on numeric rows).
-        * ``block`` – block index (1-based).
+        * ``Comment`` – annotation text, as a pandas string column
+          (missing on numeric rows).
+        * ``block`` – block index (1-based), stored as ``int16`` (``int32``
+          beyond 32767 blocks).
         * ``time_abs`` – continuous time across blocks.
 
     Raises
     ------
     ValueError
-        If the file cannot be parsed or if no data lines are found.
+        If the file cannot be parsed, if no data lines are found or if
+        ``engine`` or ``dtype`` is not supported.
+    ImportError
+        If ``engine="polars"`` and polars is not installed.
     """
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError(f"Type de données non supporté: {dtype}")
+
     p = Path(path)
-    lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()
+    with open(p, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Début des données introuvable.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_mapped(mm, engine, np.dtype(dtype))
+
 
+def _parse_mapped(
+    mm: mmap.mmap, engine: str, dtype: np.dtype
+) -> Tuple[pd.DataFrame, Dict[str, object]]:
+    """Parse the memory-mapped contents ``mm`` of a LabChart export."""
     meta: Dict[str, object] = {}
     chan_titles: Optional[List[str]] = None
     unit_names: Optional[List[str]] = None
     first_data_idx: Optional[int] = None
+    first_line = ""
+    body_start = 0
 
-    # Parse metadata lines before the data section
-    for i, ln in enumerate(lines):
+    # Parse metadata lines before the data section; only these are decoded
+    for i, raw_ln in enumerate(iter(mm.readline, b"")):
+        ln = raw_ln.decode("utf-8", "ignore").rstrip("\r\n")
         if ln.startswith("Interval="):
             meta["Interval"] = ln.split("\t", 1)[1].strip()
         elif ln.startswith("ExcelDateTime="):
@@ -81,93 +125,83 @@ def parse_labchart_txt(path: str) -> Tuple[pd.DataFrame, Dict[str, object]]:
             unit_names = [c.strip() for c in ln.split("\t")[1:]]
         elif (ln and ln[0].isdigit()) or ln.startswith(("+", "-", ".")):
             # Potentially a data line; check first token is numeric
-            if FLOAT_START.match(ln.split("\t", 1)[0]):
+            try:
+                float(ln.split("\t", 1)[0])
+            except ValueError:
+                pass
+            else:
                 first_data_idx = i
+                first_line = ln
                 break
+        body_start = mm.tell()
 
     if first_data_idx is None:
         raise ValueError("Début des données introuvable.")
 
     # Determine number of columns from first data row
-    first_row = lines[first_data_idx].split("\t")
+    first_row = first_line.split("\t")
     n_cols = len(first_row)
 
-    data: List[List[object]] = []
-    for ln in lines[first_data_idx:]:
-        if not ln.strip():
-            continue
-        parts = ln.split("\t")
-
-        # Identify the numeric part and any trailing comment part
-        numeric_parts = parts[:n_cols]
-        extra_parts = parts[n_cols:]
-
-        # Try to parse the numeric fields; treat '*' and empty fields as NaN
-        numeric_row: List[Optional[float]] = []
-        is_numeric = True
-        for x in numeric_parts:
-            val = x.strip()
-            if val in ("*", ""):
-                numeric_row.append(math.nan)
-            else:
-                try:
-                    numeric_row.append(float(val))
-                except ValueError:
-                    is_numeric = False
-                    break
-
-        # Assemble any extra fields into a comment string
-        comment_text: Optional[str] = None
-        if extra_parts:
-            comment_text = "\t".join(extra_parts).strip()
-            # Remove '#*' marker if present at the start of the comment
-            if comment_text.startswith("#*"):
-                comment_text = comment_text[2:].lstrip()
-
-        if is_numeric:
-            # Numeric row (with or without a trailing comment)
-            numeric_row.append(comment_text)
-            data.append(numeric_row)
-        else:
-            # Pure comment row: use time value and fill numeric columns with NaN
-            try:
-                t = float(parts[0])
-            except ValueError:
-                continue
-            c_text = "\t".join(parts[1:]).strip()
-            if c_text.startswith("#*"):
-                c_text = c_text[2:].lstrip()
-            row = [t] + [math.nan] * (n_cols - 1) + [c_text]
-            data.append(row)
-
-    if not data:
-        raise ValueError("Aucune ligne de données valide après parsing.")
-
-    # Construct DataFrame with appropriate column names
     if chan_titles and len(chan_titles) == (n_cols - 1):
         cols = ["Time"] + chan_titles
     else:
         cols = ["Time"] + [f"Ch{i}" for i in range(1, n_cols)]
-    cols.append("Comment")
-    df = pd.DataFrame(data, columns=cols)
-
-    # Compute block indices and continuous time
-    t = df["Time"].to_numpy(float)
-    jumps = np.where(np.diff(t) < 0)[0] + 1
-    starts = np.r_[0, jumps]
-    ends = np.r_[jumps, len(df)]
-    block_ids = np.empty(len(df), dtype=int)
-    time_abs = np.empty(len(df), dtype=float)
-    offset = 0.0
-    for b, (s, e) in enumerate(zip(starts, ends), start=1):
-        block_ids[s:e] = b
-        tb = t[s:e]
-        tb0 = tb - tb[0]
-        time_abs[s:e] = tb0 + offset
-        offset += tb0[-1] if len(tb0) else 0.0
-
-    df["block"] = block_ids
-    df["time_abs"] = time_abs
+
+    # Bulk-parse the data section one chunk at a time, so that only one
+    # chunk of raw text is held in memory alongside the parsed arrays
+    read_chunk: Callable[[bytes, int], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+    if engine == "pandas":
+        read_chunk = _read_chunk_pandas
+    elif engine == "polars":
+        read_chunk = _read_chunk_polars
+    else:
+        raise ValueError(f"Moteur de lecture inconnu: {engine}")
+
+    state = STITCH_START
+    value_parts: List[np.ndarray] = []
+    comment_parts: List[np.ndarray] = []
+    block_parts: List[np.ndarray] = []
+    time_abs_parts: List[np.ndarray] = []
+    for chunk in _iter_chunks(mm, body_start):
+        values, has_extra, is_comment_row = read_chunk(chunk, n_cols)
+        keep, comments = _extract_comments(
+            chunk, values, has_extra, is_comment_row, n_cols
+        )
+
+        # Drop blank lines; usually there are none and the arrays are used as-is
+        if not keep.all():
+            values = values[keep]
+            comments = comments[keep]
+        if len(values) == 0:
+            continue
+
+        # Compute block indices and continuous time in full precision,
+        # carrying the current block over to the next chunk
+        block_ids, time_abs, state = stitch_blocks(values[:, 0], state)
+
+        value_parts.append(values.astype(dtype, copy=False))
+        comment_parts.append(comments)
+        block_parts.append(block_ids)
+        time_abs_parts.append(time_abs.astype(dtype, copy=False))
+
+    if not value_parts:
+        raise ValueError("Aucune ligne de données valide après parsing.")
+
+    # Assemble the samples column-major so that every column of the
+    # DataFrame is one contiguous array, then wrap it without copying
+    n_rows = sum(len(v) for v in value_parts)
+    values = np.empty((n_rows, n_cols), dtype=dtype, order="F")
+    np.concatenate(value_parts, out=values)
+    df = pd.DataFrame(values, columns=cols, copy=False)
+    comment_col = pd.Series(pd.array(_concat(comment_parts), dtype=_COMMENT_DTYPE))
+    # Remove '#*' marker if present at the start of the comment
+    df["Comment"] = comment_col.str.removeprefix("#*").str.lstrip()
+
+    # Blocks are non-decreasing, so the last one bounds the index type
+    block_ids = _concat(block_parts)
+    block_dtype = np.int16 if block_ids[-1] <= np.iinfo(np.int16).max else np.int32
+    df["block"] = block_ids.astype(block_dtype)
+    df["time_abs"] = _concat(time_abs_parts)
 
     # Additional metadata: convert interval to seconds if possible
     try:
@@ -177,4 +211,188 @@ def parse_labchart_txt(path: str) -> Tuple[pd.DataFrame, Dict[str, object]]:
     if unit_names and len(unit_names) == (n_cols - 1):
         meta["UnitName"] = unit_names
 
-    return df, meta
\ No newline at end of file
+    return df, meta
+
+
+def _iter_chunks(buf: mmap.mmap, start: int) -> Iterator[bytes]:
+    """Yield ``buf[start:]`` in pieces of about ``_CHUNK_BYTES`` whole lines."""
+    size = len(buf)
+    pos = start
+    while pos < size:
+        end = buf.find(b"\n", min(pos + _CHUNK_BYTES, size) - 1)
+        end = size if end == -1 else end + 1
+        yield buf[pos:end]
+        pos = end
+
+
+def _concat(parts: List[np.ndarray]) -> np.ndarray:
+    # A single chunk (small files) is used without copying
+    return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def _extract_comments(
+    chunk: bytes,
+    values: np.ndarray,
+    has_extra: np.ndarray,
+    is_comment_row: np.ndarray,
+    n_cols: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fill in comment text for one chunk of the data section.
+
+    Row ``r`` of ``values`` is line ``r`` of ``chunk``. ``values`` is updated
+    in place for pure comment rows. Returns the mask of rows to keep (blank
+    lines and unparsable rows are dropped) and the object array of raw
+    comment texts (``None`` on rows without comment).
+    """
+    keep = np.ones(len(values), dtype=bool)
+    comments = np.full(len(values), None, dtype=object)
+
+    # Lines without any sample value may be blank; that is decided from the
+    # raw line, since a line of missing-value markers is a (NaN) sample
+    maybe_blank = np.isnan(values).all(axis=1)
+    visit = np.flatnonzero(has_extra | is_comment_row | maybe_blank)
+    if len(visit) == 0:
+        return keep, comments
+
+    # Second pass, in Python, over the (few) rows that carry a comment or no
+    # sample value; only these lines are located and decoded
+    ends = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+    for r in visit:
+        begin = int(ends[r - 1]) + 1 if r else 0
+        end = int(ends[r]) if r < len(ends) else len(chunk)
+        line = chunk[begin:end].decode("utf-8", "ignore")
+        if maybe_blank[r] and not line.strip():
+            keep[r] = False
+            continue
+        parts = line.rstrip("\r").split("\t")
+        if is_comment_row[r]:
+            row = _parse_numeric(parts[:n_cols])
+            if row is not None:
+                # Cells the reader did not convert (e.g. "NaN", " * ") are
+                # valid samples after all: keep the row numeric
+                values[r, : len(row)] = row
+                if has_extra[r]:
+                    comments[r] = "\t".join(parts[n_cols:]).strip()
+                continue
+            # Pure comment row: use time value and fill numeric columns with NaN
+            try:
+                t = float(parts[0])
+            except ValueError:
+                keep[r] = False
+                continue
+            values[r, 0] = t
+            values[r, 1:] = _NAN
+            comments[r] = "\t".join(parts[1:]).strip()
+        elif has_extra[r]:
+            comments[r] = "\t".join(parts[n_cols:]).strip()
+
+    return keep, comments
+
+
+def _parse_numeric(cells: List[str]) -> Optional[List[float]]:
+    """Parse sample cells with ``float()``, or return ``None`` if one fails.
+
+    Cells are stripped first; ``*`` and empty cells are missing samples.
+    """
+    try:
+        return [_NAN if (v := x.strip()) in _NA_SET else float(v) for x in cells]
+    except ValueError:
+        return None
+
+
+def _read_chunk_pandas(
+    chunk: bytes, n_cols: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse one chunk of the data section with pandas' C reader.
+
+    Returns the ``(n_rows, n_cols)`` float array of samples (one row per
+    line, blank lines included), a mask of rows with trailing fields
+    (comments) and a mask of rows holding non-numeric cells (pure comment
+    rows).
+    """
+    # The first trailing field (if any) is read as text to flag comment rows.
+    # pandas rejects ``usecols`` wider than the widest line, so a leading line
+    # of empty fields guarantees that column exists; it is dropped below.
+    # Only "\n" ends a line, as when comments are located in the chunk, so a
+    # stray "\r" inside a comment cannot shift the rows; "\r\n" endings are
+    # turned into "\n" so the last field carries no "\r".
+    na_values: Dict[int, object] = {i: _NA_SET for i in range(n_cols)}
+    na_values[n_cols] = {""}
+    raw = pd.read_csv(
+        io.BytesIO(b"\t" * n_cols + b"\n" + chunk.replace(b"\r\n", b"\n")),
+        sep="\t",
+        header=None,
+        names=list(range(n_cols + 1)),
+        usecols=list(range(n_cols + 1)),
+        na_values=na_values,
+        keep_default_na=False,
+        skip_blank_lines=False,
+        quoting=csv.QUOTE_NONE,
+        dtype={n_cols: object},
+        encoding="utf-8",
+        encoding_errors="ignore",
+        lineterminator="\n",
+        engine="c",
+        low_memory=False,
+    )
+
+    has_extra = raw.pop(n_cols).notna().to_numpy()
+
+    # Columns holding non-numeric cells come from pure comment rows
+    is_comment_row = np.zeros(len(raw), dtype=bool)
+    for c in raw.columns:
+        if raw[c].dtype.kind not in "fi":
+            as_num = pd.to_numeric(raw[c], errors="coerce")
+            is_comment_row |= (as_num.isna() & raw[c].notna()).to_numpy()
+            raw[c] = as_num
+
+    return raw.to_numpy(dtype=float)[1:], has_extra[1:], is_comment_row[1:]
+
+
+def _read_chunk_polars(
+    chunk: bytes, n_cols: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse one chunk of the data section with polars' multi-threaded reader.
+
+    Same contract as :func:`_read_chunk_pandas`. Requires the optional
+    ``polars`` dependency.
+    """
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise ImportError(
+            "engine='polars' nécessite le paquet optionnel 'polars' "
+            "(pip install labchart_parser[polars])."
+        ) from exc
+
+    # Everything is read as text, then cast: pure comment rows put
+    # non-numeric cells in numeric columns, which a Float64 schema rejects.
+    names = [f"c{i}" for i in range(n_cols + 1)]
+    raw = pl.read_csv(
+        chunk,
+        has_header=False,
+        separator="\t",
+        quote_char=None,
+        schema={name: pl.String for name in names},
+        null_values=sorted(_NA_SET),
+        truncate_ragged_lines=True,
+        missing_columns="insert",
+        extra_columns="ignore",
+        encoding="utf8-lossy",
+    )
+
+    # Missing-value markers are matched after stripping, like plain cells
+    text = raw.select(pl.col(name).str.strip_chars() for name in names[:-1])
+    numeric = text.select(pl.all().cast(pl.Float64, strict=False))
+    failed = pl.any_horizontal(
+        numeric[name].is_null()
+        & text[name].is_not_null()
+        & ~text[name].is_in(list(_NA_SET))
+        for name in names[:-1]
+    )
+
+    return (
+        numeric.to_numpy().astype(float, copy=False),
+        raw[names[-1]].is_not_null().to_numpy(),
+        raw.select(failed).to_series().to_numpy(),
+    )
@@ -0,0 +1,63 @@
+"""Tests for :class:`labchart_parser.LabChartFile`."""
+
+import numpy as np
+import pytest
+
+from labchart_parser import LabChartFile, _kernels
+
+HEADER = "Interval=\t0.1 s\nChannelTitle=\tFlow\tPressure\n"
+
+# Run against every cycle-pairing implementation so they cannot drift apart
+PAIR_IMPLS = pytest.mark.parametrize(
+    "impl",
+    [_kernels._pair_cycles_impl, _kernels._pair_cycles_numpy, _kernels._pair_cycles_loop],
+    ids=["default", "numpy", "loop"],
+)
+
+
+@pytest.fixture
+def lc(tmp_path):
+    path = tmp_path / "export.txt"
+    path.write_text(
+        HEADER
+        + "0.0\t0\t1\n"
+        + "0.1\t0\t3\t#* inspi \n"
+        + "0.2\t0\t*\n"
+        + "0.3\t0\t7\n"
+        + "0.4\t0\t2\t#*  Expi \n"
+        + "0.5\t0\t4\t#* INSPI\n"
+        + "0.6\t0\t5\n"
+        + "0.0\t0\t9\t#* INSPI\n"
+        + "0.1\t0\t8\t#* EXPI\n",
+        encoding="utf-8",
+    )
+    return LabChartFile.from_file(str(path))
+
+
+@PAIR_IMPLS
+def test_paired_cycles(lc, monkeypatch, impl):
+    monkeypatch.setattr(_kernels, "_pair_cycles_impl", impl)
+    # Labels match ignoring case and spaces; the NaN sample is ignored by the
+    # max and the last INSPI, without a later EXPI, is dropped
+    cycles = lc.paired_cycles(1, "Pressure")
+    assert list(cycles.columns) == [
+        "start_time", "end_time", "start_value", "end_value", "value_diff"
+    ]
+    np.testing.assert_allclose(cycles.to_numpy(), [[0.1, 0.4, 3.0, 2.0, 4.0]])
+
+    # Events of another block are not paired across the block boundary
+    cycles = lc.paired_cycles(2, "Pressure")
+    np.testing.assert_allclose(cycles.to_numpy(), [[0.6, 0.7, 9.0, 8.0, 0.0]])
+
+    assert lc.paired_cycles(5, "Pressure").empty
+
+
+@PAIR_IMPLS
+def test_pair_cycles_nearest_sample(monkeypatch, impl):
+    monkeypatch.setattr(_kernels, "_pair_cycles_impl", impl)
+    t = np.array([0.0, 1.0, 2.0, 3.0])
+    p = np.array([1.0, 5.0, np.nan, 2.0])
+    # 0.5 is halfway between two samples: the earlier one is used; 2.6 is
+    # closest to the last sample and 9 has no later end
+    out = _kernels.pair_cycles(t, p, np.array([0.5, 9.0]), np.array([2.6]))
+    np.testing.assert_array_equal(np.column_stack(out), [[0.5, 2.6, 1.0, 2.0, 4.0]])
@@ -0,0 +1,130 @@
+"""Regression tests for :func:`labchart_parser.parse_labchart_txt`."""
+
+import numpy as np
+import pytest
+
+from labchart_parser import _kernels, parse_labchart_txt, parser
+
+HEADER = "Interval=\t0.001 s\nChannelTitle=\tFlow\tPressure\nUnitName=\tL/s\tcmH2O\n"
+
+
+def _export(tmp_path, body):
+    path = tmp_path / "export.txt"
+    path.write_text(HEADER + body, encoding="utf-8")
+    return str(path)
+
+
+def test_export_without_comments(tmp_path):
+    # No line carries a trailing comment field
+    path = _export(tmp_path, "0.000\t1\t2\n0.001\t3\t4\n0.000\t5\t6\n")
+    df, meta = parse_labchart_txt(path)
+    np.testing.assert_array_equal(df["Flow"], [1, 3, 5])
+    np.testing.assert_array_equal(df["Pressure"], [2, 4, 6])
+    assert df["Comment"].isna().all()
+    assert list(df["block"]) == [1, 1, 2]
+    assert meta["Interval_s"] == 0.001
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_unconverted_cells_keep_row_numeric(tmp_path, engine):
+    # "NaN" and padded missing-value markers are samples, not comments
+    if engine == "polars":
+        pytest.importorskip("polars")
+    path = _export(
+        tmp_path, "0.000\t1\t2\n0.001\tNaN\t3\n0.002\t * \t4\n0.003\t5\t \n0.004\t#* start\n"
+    )
+    df, _ = parse_labchart_txt(path, engine=engine)
+    np.testing.assert_array_equal(df["Flow"], [1, np.nan, np.nan, 5, np.nan])
+    np.testing.assert_array_equal(df["Pressure"], [2, 3, 4, np.nan, np.nan])
+    assert df["Comment"].isna().tolist() == [True, True, True, True, False]
+    assert df["Comment"].iloc[-1] == "start"
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_carriage_return_in_comment(tmp_path, engine):
+    # Only "\n" ends a line; CRLF endings and a stray "\r" in a comment
+    # must not shift the rows that follow
+    if engine == "polars":
+        pytest.importorskip("polars")
+    path = _export(
+        tmp_path,
+        "0.000\t1\t2\r\n0.001\t2\t3\t#* a\rb\r\n0.002\t3\t4\r\n"
+        "0.003\t5\t6\t#* c\r\n\r\n0.004\t7\t8\r\n",
+    )
+    df, _ = parse_labchart_txt(path, engine=engine)
+    np.testing.assert_array_equal(df["Time"], [0.0, 0.001, 0.002, 0.003, 0.004])
+    np.testing.assert_array_equal(df["Pressure"], [2, 3, 4, 6, 8])
+    assert df["Comment"].tolist()[1] == "a\rb"
+    assert df["Comment"].tolist()[3] == "c"
+    assert df["Comment"].isna().sum() == 3
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_blank_and_missing_lines(tmp_path, engine):
+    # Whitespace-only lines are skipped and do not hide a block reset; a line
+    # of missing-value markers is a sample
+    if engine == "polars":
+        pytest.importorskip("polars")
+    path = _export(
+        tmp_path, "0.0\t1\t2\n0.1\t3\t4\n   \n \t \t \n0.0\t5\t6\n0.1\t7\t8\n*\t*\t*\n"
+    )
+    df, _ = parse_labchart_txt(path, engine=engine)
+    assert list(df["block"]) == [1, 1, 2, 2, 2]
+    np.testing.assert_array_equal(df["Time"], [0.0, 0.1, 0.0, 0.1, np.nan])
+    np.testing.assert_allclose(df["time_abs"][:4], [0.0, 0.1, 0.1, 0.2])
+    np.testing.assert_array_equal(df["Pressure"], [2, 4, 6, 8, np.nan])
+    assert df["Comment"].isna().all()
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+@pytest.mark.parametrize(
+    "stitch", [_kernels._stitch_impl, _kernels._stitch_numpy], ids=["default", "numpy"]
+)
+def test_chunked_parse_matches_single_chunk(tmp_path, monkeypatch, engine, stitch):
+    # Chunks of a few bytes put block resets, continued blocks and comment
+    # rows on chunk boundaries
+    if engine == "polars":
+        pytest.importorskip("polars")
+    path = _export(
+        tmp_path,
+        "0.0\t1\t2\n0.1\t2\t3\t#* a\n0.2\t3\t4\n0.0\t4\t5\n0.1\t#* pure\n"
+        "0.2\t5\t6\n0.3\t6\t7\t#* b\n0.1\t7\t8\n0.2\t8\t9\n",
+    )
+    expected, _ = parse_labchart_txt(path, engine=engine)
+    assert list(expected["block"]) == [1, 1, 1, 2, 2, 2, 2, 3, 3]
+    assert expected["Comment"].dropna().tolist() == ["a", "pure", "b"]
+
+    monkeypatch.setattr(_kernels, "_stitch_impl", stitch)
+    for size in (1, 4, 9, 16, 25, 40):
+        monkeypatch.setattr(parser, "_CHUNK_BYTES", size)
+        df, _ = parse_labchart_txt(path, engine=engine)
+        np.testing.assert_array_equal(df["block"], expected["block"])
+        np.testing.assert_array_equal(df["time_abs"], expected["time_abs"])
+        np.testing.assert_array_equal(df["Pressure"], expected["Pressure"])
+        assert df["Comment"].tolist() == expected["Comment"].tolist()
+
+
+def test_float32_dtype(tmp_path):
+    # Stitching runs in float64: the backwards step between these times is
+    # lost in float32 but must still start a new block
+    path = _export(tmp_path, "100000.002\t1\t2\n100000.001\t3\t4\t#* x\n")
+    df, _ = parse_labchart_txt(path, dtype="float32")
+    for col in ("Time", "Flow", "Pressure", "time_abs"):
+        assert df[col].dtype == np.float32
+    assert df["block"].dtype == np.int16
+    assert list(df["block"]) == [1, 2]
+    assert df["Comment"].tolist()[1] == "x"
+
+
+def test_unsupported_dtype(tmp_path):
+    path = _export(tmp_path, "0.0\t1\t2\n")
+    with pytest.raises(ValueError):
+        parse_labchart_txt(path, dtype="int32")
+
+
+def test_block_ids_widen_past_int16(tmp_path):
+    # Every "0.0" after "0.1" starts a block: 40000 blocks overflow int16
+    path = _export(tmp_path, "0.1\t1\t2\n0.0\t1\t2\n" * 40000)
+    df, _ = parse_labchart_txt(path)
+    assert df["block"].dtype == np.int32
+    assert df["block"].iloc[-1] == 40001